@@ -22,6 +22,8 @@ Usage:
     Run the script and follow the menu prompts to manage books and users.
 """
 
+import bisect
+
 
 
 
@@ -29,12 +31,14 @@ def input_valid(msg, start, end):
     # Prompt user until they enter a numeric value within [start, end]
     while True:
         inp = input(msg)
-        if not inp.isdecimal():
+        try:
+            value = int(inp)
+        except ValueError:
             print("Invalid Input..., Enter a numeric value.")
-        elif not start <= int(inp) <= end:
-            print("Invalid Range..., Try again!")
-        else:
-            return int(inp)
+            continue
+        if start <= value <= end:
+            return value
+        print("Invalid Range..., Try again!")
 
 
 
@@ -44,45 +48,50 @@ class Book:
         self.id = id
         self.total_quantity = total_quantity
         self.total_borrows = 0
+        self.borrowers = set()      # names of users currently borrowing
+        self._str_cache = None      # formatted repr, dropped when counts change
 
-    def borrow(self):
+    def borrow(self, user):
         if self.total_quantity - self.total_borrows == 0:
             return False
         self.total_borrows += 1
+        self.borrowers.add(user.name)
+        self._str_cache = None
         return True
 
-    def return_copy(self):
+    def return_copy(self, user):
         if self.total_borrows == 0:
             return False
         self.total_borrows -= 1
+        self.borrowers.discard(user.name)
+        self._str_cache = None
         return True
 
     def __str__(self):
-        return f'Book name: {self.name}\t\tBook id: {self.id}\t\ttotal_quantity: {self.total_quantity}\t\ttotal_borrows: {self.total_borrows}'
+        if self._str_cache is None:
+            self._str_cache = f'Book name: {self.name}\t\tBook id: {self.id}\t\ttotal_quantity: {self.total_quantity}\t\ttotal_borrows: {self.total_borrows}'
+        return self._str_cache
 
 class User:
     def __init__(self, name, id):
         self.name = name
         self.id = id
-        self.borrowed_books = []
+        self.borrowed_books = {}    # book id -> Book
+        self._str_cache = None      # formatted repr; name and id never change
 
     def borrow(self, book):
-        self.borrowed_books.append(book)
+        self.borrowed_books[book.id] = book
 
     def return_copy(self, borrowed_book):
-        for idx, book in enumerate(self.borrowed_books):
-            if book.id == borrowed_book.id:
-                del self.borrowed_books[book.id - 1]
-                break
+        self.borrowed_books.pop(borrowed_book.id, None)
 
     def is_borrowed(self, borrowed_book):
-        for book in self.borrowed_books:
-            if book.id == borrowed_book.id:
-                return True
-        return False
+        return borrowed_book.id in self.borrowed_books
 
     def __str__(self):
-        return f'user name: {self.name}\t\tid: {self.id}'
+        if self._str_cache is None:
+            self._str_cache = f'user name: {self.name}\t\tid: {self.id}'
+        return self._str_cache
 
 
 
@@ -90,33 +99,67 @@ class BackendManager:
     def __init__(self):
         self.books = []
         self.users = []
+        # Name indices for O(1) lookups (the lists keep insertion order)
+        self._books_by_name = {}
+        self._books_by_id = {}
+        self._users_by_name = {}
+        # Memoized results of get_books_with_prefix, reset whenever a book is added
+        self._prefix_cache = {}
+        # Book names kept sorted so prefix queries can bisect instead of scanning
+        self._book_names_sorted = []
 
     def add_book(self, name, id, total_quantity):
-        self.books.append(Book(name, id, total_quantity))
+        # Duplicate names or ids would shadow the old book in the indices
+        if name in self._books_by_name or id in self._books_by_id:
+            return False
+        book = Book(name, id, total_quantity)
+        self.books.append(book)
+        self._books_by_name[name] = book
+        self._books_by_id[id] = book
+        bisect.insort(self._book_names_sorted, name)
+        self._prefix_cache.clear()
+        return True
+
+    def bulk_add_books(self, rows):
+        # Load many (name, id, total_quantity) rows at once, paying for the
+        # sorted-name rebuild and cache clear a single time instead of per book
+        for name, id, total_quantity in rows:
+            if name in self._books_by_name or id in self._books_by_id:
+                continue
+            book = Book(name, id, total_quantity)
+            self.books.append(book)
+            self._books_by_name[name] = book
+            self._books_by_id[id] = book
+        self._book_names_sorted = sorted(self._books_by_name)
+        self._prefix_cache.clear()
 
     def add_user(self, name, id):
-        self.users.append(User(name, id))
+        if name in self._users_by_name:
+            return False
+        user = User(name, id)
+        self.users.append(user)
+        self._users_by_name[name] = user
+        return True
 
     def get_user_by_name(self, user_name):
-        for user in self.users:
-            if user.name == user_name:
-                return user
-        return None
+        return self._users_by_name.get(user_name)
 
     def get_book_by_name(self, book_name):
-        for book in self.books:
-            if book.name == book_name:
-                return book
-        return None
+        return self._books_by_name.get(book_name)
+
+    def get_book_by_id(self, book_id):
+        return self._books_by_id.get(book_id)
 
     def borrow_book(self, user_name, book_name):
         user = self.get_user_by_name(user_name)
         book = self.get_book_by_name(book_name)
+        return self.borrow_book_obj(user, book)
 
+    def borrow_book_obj(self, user, book):
         if user is None or book is None:
             return False
 
-        if book.borrow():
+        if book.borrow(user):
             user.borrow(book)
             return True
         return False
@@ -124,13 +167,15 @@ class BackendManager:
     def return_book(self, user_name, book_name):
         user = self.get_user_by_name(user_name)
         book = self.get_book_by_name(book_name)
+        return self.return_book_obj(user, book)
 
+    def return_book_obj(self, user, book):
         if user is None or book is None:
             return False
 
         if user.is_borrowed(book):
             user.return_copy(book)
-            book.return_copy()
+            book.return_copy(user)
             return True
 
         return False
@@ -140,20 +185,29 @@ class BackendManager:
         if book is None:
             return []
 
-        return [user.name for user in self.users if user.is_borrowed(book)]
+        return list(book.borrowers)
 
     def get_books_with_prefix(self, prefix):
-        return [book for book in self.books if book.name.startswith(prefix)]
+        if not prefix:
+            # Every name matches the empty prefix, so skip the filtering entirely
+            return self.books
+
+        books = self._prefix_cache.get(prefix)
+        if books is None:
+            names = self._book_names_sorted
+            books = []
+            idx = bisect.bisect_left(names, prefix)
+            while idx < len(names) and names[idx].startswith(prefix):
+                books.append(self._books_by_name[names[idx]])
+                idx += 1
+            self._prefix_cache[prefix] = books
+        return books
 
 
 
 class FrontendManager:
     def __init__(self):
         self.backend = BackendManager()
-        self.add_dummy_data()
-
-    def print_options(self):
-        print('Program options:')
 
         menu = [
             'Add book',
@@ -165,19 +219,38 @@ class FrontendManager:
             'Print users borrowed book',
             'Print users',
         ]
+        # The menu never changes, so format the prompt once instead of per iteration
+        self._menu_len = len(menu)
+        self._menu_text = '\n'.join(f'{idx + 1}) {msg}' for idx, msg in enumerate(menu))
+        self._menu_prompt = f'Enter your choice from (1 to {self._menu_len}): '
+        # Bound methods in menu order: choice N maps to self._dispatch[N - 1]
+        self._dispatch = (
+            self.add_book,
+            self.print_library_books,
+            self.print_name_prefix,
+            self.add_user,
+            self.borrow_book,
+            self.return_book,
+            self.print_users_borrowed_book,
+            self.print_users,
+        )
 
-        messages = [f'{idx + 1}) {msg}' for idx, msg in enumerate(menu)]
-        print('\n'.join(messages))
+        self.add_dummy_data()
 
-        return input_valid(f'Enter your choice from (1 to {len(messages)}): ', 1, len(messages))
+    def print_options(self):
+        print('Program options:')
+        print(self._menu_text)
+        return input_valid(self._menu_prompt, 1, self._menu_len)
 
     def add_dummy_data(self):
-        self.backend.add_book('math4', '100', 3)
-        self.backend.add_book('math2', '101', 5)
-        self.backend.add_book('math1', '102', 4)
-        self.backend.add_book('math3', '103', 2)
-        self.backend.add_book('prog1', '201', 3)
-        self.backend.add_book('prog2', '202', 3)
+        self.backend.bulk_add_books([
+            ('math4', '100', 3),
+            ('math2', '101', 5),
+            ('math1', '102', 4),
+            ('math3', '103', 2),
+            ('prog1', '201', 3),
+            ('prog2', '202', 3),
+        ])
 
         self.backend.add_user('mostafa', '30301')
         self.backend.add_user('ali', '50501')
@@ -190,31 +263,17 @@ class FrontendManager:
     def run(self):
         while True:
             choice = self.print_options()
-            if choice == 1:
-                self.add_book()
-            elif choice == 2:
-                self.print_library_books()
-            elif choice == 3:
-                self.print_name_prefix()
-            elif choice == 4:
-                self.add_user()
-            elif choice == 5:
-                self.borrow_book()
-            elif choice == 6:
-                self.return_book()
-            elif choice == 7:
-                self.print_users_borrowed_book()
-            elif choice == 8:
-                self.print_users()
-            else:
+            if not 1 <= choice <= len(self._dispatch):
                 break
+            self._dispatch[choice - 1]()
 
     def add_book(self):
         print('Enter book info: ')
         book_name = input('Book name: ')
         book_id   = input('Book id: ')
         total_quantity = int(input('Total quantity: '))
-        self.backend.add_book(book_name, book_id, total_quantity)
+        if not self.backend.add_book(book_name, book_id, total_quantity):
+            print('A book with this name already exists!')
 
     def print_name_prefix(self, just_print_all = False):
         prefix = ''
@@ -222,7 +281,7 @@ class FrontendManager:
             prefix = input('Enter book name prefix: ')
 
         books = self.backend.get_books_with_prefix(prefix)
-        books_str = '\n'.join([str(book) for book in books])
+        books_str = '\n'.join(map(str, books))
         print(books_str)
 
     def print_library_books(self):
@@ -232,12 +291,13 @@ class FrontendManager:
         print('Enter user info: ')
         user_name = input('User name: ')
         user_id = input('User id: ')
-        self.backend.add_user(user_name, user_id)
+        if not self.backend.add_user(user_name, user_id):
+            print('A user with this name already exists!')
 
-    def read_user_name_and_book_name(self, trials = 3):
+    def read_user_and_book(self, trials = 3):
         """
-        The function tries to read valid user name and password up to #trials
-        If finally correct, it returns the read names, otherwise None, None
+        The function tries to read valid user name and book name up to #trials
+        If finally correct, it returns the resolved objects, otherwise None, None
         """
         trials += 1
 
@@ -246,36 +306,38 @@ class FrontendManager:
             print('Enter user name and book name')
 
             user_name = input('User name: ')
-            if self.backend.get_user_by_name(user_name) is None:
+            user = self.backend.get_user_by_name(user_name)
+            if user is None:
                 print('Invalid user name!')
                 continue
 
             book_name = input('Book name: ')
-            if self.backend.get_book_by_name(book_name) is None:
+            book = self.backend.get_book_by_name(book_name)
+            if book is None:
                 print('Invalid book name!')
                 continue
 
-            return user_name, book_name
+            return user, book
 
         print('You did several trials! Try later.')
         return None, None
 
     def borrow_book(self):
-        user_name, book_name = self.read_user_name_and_book_name()
+        user, book = self.read_user_and_book()
 
-        if user_name is None or book_name is None:
+        if user is None or book is None:
             return
 
-        if not self.backend.borrow_book(user_name, book_name):
+        if not self.backend.borrow_book_obj(user, book):
             print('Failed to borrow the book!')
 
     def return_book(self):
-        user_name, book_name = self.read_user_name_and_book_name()
-        if user_name is None or book_name is None:
+        user, book = self.read_user_and_book()
+        if user is None or book is None:
             print('No such book or user')
             return
 
-        if not self.backend.return_book(user_name, book_name):
+        if not self.backend.return_book_obj(user, book):
             print('This user did not borrow this book!')
         else:
             print('Book returned successfully!')
@@ -283,10 +345,11 @@ class FrontendManager:
 
     def print_users_borrowed_book(self):
         book_name = input('Book name: ')
-        if self.backend.get_book_by_name(book_name) is None:
+        book = self.backend.get_book_by_name(book_name)
+        if book is None:
             print('Invalid book name!')
         else:
-            users_lst = self.backend.get_users_borrowed_book(book_name)
+            users_lst = list(book.borrowers)
 
             if not users_lst:
                 print('\nNo one borrowed this book')
@@ -296,7 +359,7 @@ class FrontendManager:
                     print(user)
 
     def print_users(self):
-        users_str = '\n'.join([str(user) for user in self.backend.users])
+        users_str = '\n'.join(map(str, self.backend.users))
         print(users_str)
 
 